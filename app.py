@@ -1,38 +1,54 @@
 from flask import Flask
 from flask_cors import CORS
-from datetime import datetime
-import pytz
 
 from extensions import db, migrate
 from config import Config
+from utils.suggest_index import suggest_index
+from utils.compression import compressor
+from utils.single_flight import single_flight
+from utils.db_pool import configure_pool
+from utils.json_provider import init_json_provider
+from utils.lifecycle import lifecycle
 
-def create_app():
+def create_app(warm_up=False):
     app = Flask(__name__)
     app.config.from_object(Config)
+    init_json_provider(app)
+    configure_pool(app)
     
     db.init_app(app)
     migrate.init_app(app, db)
+    suggest_index.init_app(app)
+    compressor.init_app(app)
+    single_flight.init_app(app)
     CORS(app)
     
     from routes.jake_routes import jake_bp
     from routes.nailstudio_routes import nailstudio_bp
+    from routes.health_routes import health_bp
     
     app.register_blueprint(jake_bp, url_prefix='/api')
     app.register_blueprint(nailstudio_bp, url_prefix='/api')
+    app.register_blueprint(health_bp, url_prefix='/api')
     
-    @app.route('/api/health')
-    def health_check():
-        return {
-            'success': True,
-            'message': 'GyH API is running!',
-            'status': 'healthy',
-            'timestamp': datetime.now(pytz.timezone('Asia/Jakarta')).isoformat()
-        }
+    @app.cli.command('recompute-scores')
+    def recompute_scores_command():
+        """Backfill NailStudio.score against the current mean rating"""
+        from models.nailstudio import NailStudio
+        
+        NailStudio.sync_score_prior(force=True)
+        print("✅ Ranking scores recomputed")
+    
+    # Off by default so `flask db ...` and other CLI commands never touch the DB
+    # at startup; gunicorn warms each worker after fork (gunicorn.conf.py)
+    if warm_up:
+        lifecycle.warm_up(app)
     
     return app
 
 if __name__ == '__main__':
     app = create_app()
+    lifecycle.warm_up(app)
     
     print("🚀 GyH API Server Starting...")
     print(f"📁 Database: {app.config['SQLALCHEMY_DATABASE_URI']}")
@@ -19,14 +19,29 @@ class Config:
     
     SQLALCHEMY_DATABASE_URI = f"postgresql://{DB_USER}:{encoded_password}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+    # Bounds every new connection attempt, so an unreachable DB can't stall warm-up
+    # or readiness past gunicorn's worker timeout
+    DB_CONNECT_TIMEOUT = int(os.environ.get('DB_CONNECT_TIMEOUT', 5))
     SQLALCHEMY_ENGINE_OPTIONS = {
         'pool_pre_ping': True,
         'pool_recycle': 300,
         'pool_timeout': 20,
         'pool_size': 10,
-        'max_overflow': 20
+        'max_overflow': 20,
+        'connect_args': {'connect_timeout': DB_CONNECT_TIMEOUT}
     }
     
+    # DB Pool Configuration
+    # 'static' uses SQLALCHEMY_ENGINE_OPTIONS as-is; 'adaptive' derives pool_size and
+    # max_overflow from WEB_CONCURRENCY x WEB_THREADS and DB_CONNECTION_BUDGET; the budget
+    # must be at least WEB_CONCURRENCY, and below WEB_CONCURRENCY x WEB_THREADS it warns
+    DB_POOL_MODE = os.environ.get('DB_POOL_MODE', 'static')
+    DB_CONNECTION_BUDGET = int(os.environ.get('DB_CONNECTION_BUDGET', 80))
+    WEB_CONCURRENCY = int(os.environ.get('WEB_CONCURRENCY', 1))
+    WEB_THREADS = int(os.environ.get('WEB_THREADS', 1))
+    DB_POOL_METRICS = os.environ.get('DB_POOL_METRICS', 'True').lower() == 'true'
+    DB_POOL_SLOW_WAIT_MS = float(os.environ.get('DB_POOL_SLOW_WAIT_MS', 100))
+    
     # Jake Images Configuration
     JAKE_IMAGES_FOLDER = os.environ.get('JAKE_IMAGES_FOLDER', 'jake_images')
     ALLOWED_EXTENSIONS = {'jpg', 'jpeg', 'png', 'gif'}
@@ -36,6 +51,37 @@ class Config:
     ITEMS_PER_PAGE = int(os.environ.get('ITEMS_PER_PAGE', 20))
     MAX_ITEMS_PER_PAGE = 100
     
+    # Ranking Score Configuration (Bayesian average of rating vs. global mean)
+    SCORE_PRIOR_WEIGHT = float(os.environ.get('SCORE_PRIOR_WEIGHT', 10))
+    SCORE_PRIOR_DRIFT = float(os.environ.get('SCORE_PRIOR_DRIFT', 0.05))
+    
+    # Typeahead Configuration
+    SUGGEST_MAX_RESULTS = int(os.environ.get('SUGGEST_MAX_RESULTS', 10))
+    SUGGEST_VERSION_FILE = os.environ.get('SUGGEST_VERSION_FILE')
+    
+    # Response Pipeline Configuration
+    JSON_PROVIDER = os.environ.get('JSON_PROVIDER', 'orjson')
+    COMPRESS_ENABLED = os.environ.get('COMPRESS_ENABLED', 'True').lower() == 'true'
+    COMPRESS_MIN_SIZE = int(os.environ.get('COMPRESS_MIN_SIZE', 1024))
+    COMPRESS_GZIP_LEVEL = int(os.environ.get('COMPRESS_GZIP_LEVEL', 6))
+    COMPRESS_BR_LEVEL = int(os.environ.get('COMPRESS_BR_LEVEL', 4))
+    COMPRESS_ALGORITHMS = ['br', 'gzip']
+    
+    # Request Coalescing Configuration
+    SINGLE_FLIGHT_TTL = float(os.environ.get('SINGLE_FLIGHT_TTL', 1.0))
+    SINGLE_FLIGHT_STALE = float(os.environ.get('SINGLE_FLIGHT_STALE', 5.0))
+    SINGLE_FLIGHT_WAIT_TIMEOUT = float(os.environ.get('SINGLE_FLIGHT_WAIT_TIMEOUT', 10.0))
+    SINGLE_FLIGHT_MAX_ENTRIES = int(os.environ.get('SINGLE_FLIGHT_MAX_ENTRIES', 256))
+    SINGLE_FLIGHT_LOCK_DIR = os.environ.get('SINGLE_FLIGHT_LOCK_DIR')
+    SINGLE_FLIGHT_LOCK_STRIPES = int(os.environ.get('SINGLE_FLIGHT_LOCK_STRIPES', 64))
+    SINGLE_FLIGHT_VERSION_FILE = os.environ.get('SINGLE_FLIGHT_VERSION_FILE')
+    
+    # Serving Lifecycle Configuration
+    DRAIN_SECONDS = float(os.environ.get('DRAIN_SECONDS', 10))
+    READINESS_MAX_DB_LATENCY_MS = float(os.environ.get('READINESS_MAX_DB_LATENCY_MS', 500))
+    # Must stay well under gunicorn's worker timeout (30s), since warm-up runs before the first heartbeat
+    WARMUP_BUDGET_SECONDS = float(os.environ.get('WARMUP_BUDGET_SECONDS', 15))
+    
     @classmethod
     def validate_config(cls):
         """Validate configuration"""
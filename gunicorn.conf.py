@@ -0,0 +1,53 @@
+# gunicorn.conf.py - Production server configuration
+#
+#   gunicorn -c gunicorn.conf.py wsgi:app
+#
+# Worker/thread counts come from the same WEB_CONCURRENCY/WEB_THREADS settings
+# that DB_POOL_MODE=adaptive uses to size each worker's connection pool.
+import gc
+import os
+
+from config import Config
+
+bind = os.environ.get('GUNICORN_BIND', '0.0.0.0:6002')
+workers = Config.WEB_CONCURRENCY
+threads = Config.WEB_THREADS
+worker_class = 'gthread' if threads > 1 else 'sync'
+
+# Load the app once in the master and fork workers from it
+preload_app = True
+
+# Warm-up runs before a worker's first heartbeat; WARMUP_BUDGET_SECONDS keeps it under this
+timeout = 30
+keepalive = 5
+# Workers keep serving for DRAIN_SECONDS after SIGTERM, then finish in-flight requests
+graceful_timeout = int(Config.DRAIN_SECONDS) + 30
+
+accesslog = '-'
+errorlog = '-'
+
+
+def when_ready(server):
+    # Move everything loaded so far out of the GC's reach so collections in the
+    # workers don't touch (and copy) the pages shared with the master
+    gc.freeze()
+
+
+def post_fork(server, worker):
+    from wsgi import app
+    from extensions import db
+
+    # Drop any connections inherited from the master without closing them under it
+    with app.app_context():
+        db.engine.dispose(close=False)
+
+
+def post_worker_init(worker):
+    from wsgi import app
+    from utils.lifecycle import lifecycle
+
+    # Runs before the worker accepts connections, so it only takes traffic warm
+    timings = lifecycle.warm_up(app)
+    worker.log.info(f'Worker {worker.pid} warmed up: {timings}')
+
+    lifecycle.install_drain_handler(worker, Config.DRAIN_SECONDS)
@@ -1,3 +1,4 @@
 from .nailstudio import NailStudio
+from .ranking_prior import RankingPrior
 
-__all__ = ['NailStudio']
+__all__ = ['NailStudio', 'RankingPrior']
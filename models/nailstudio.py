@@ -1,10 +1,26 @@
 from extensions import db
+from flask import current_app
+from sqlalchemy import func, event, select
+from sqlalchemy.exc import IntegrityError
+from models.ranking_prior import RankingPrior
 from datetime import datetime
 import pytz
 import uuid
 
+
+def bayesian_score(rating, total_reviews, prior_mean, prior_weight):
+    """Bayesian average of a rating against the global prior mean"""
+    rating = float(rating or 0.0)
+    total_reviews = max(int(total_reviews or 0), 0)
+    if prior_weight + total_reviews <= 0:
+        return rating
+    return (prior_weight * prior_mean + rating * total_reviews) / (prior_weight + total_reviews)
+
 class NailStudio(db.Model):
     __tablename__ = 'nail_studios'
+    # id breaks score ties (every unreviewed studio scores exactly the prior),
+    # so sort_by=score pages in a stable order straight off this index
+    __table_args__ = (db.Index('ix_nail_studios_score_id', 'score', 'id'),)
     
     id = db.Column(db.String(50), primary_key=True, default=lambda: f"ns_{datetime.now().strftime('%Y%m%d%H%M%S')}_{str(uuid.uuid4())[:8]}")
     nama = db.Column(db.String(255), nullable=False, index=True)
@@ -17,6 +33,7 @@ class NailStudio(db.Model):
     
     rating = db.Column(db.Float, default=0.0, index=True)
     totalReviews = db.Column(db.Integer, default=0)
+    score = db.Column(db.Float, default=0.0)
     
     description = db.Column(db.Text)
     photoUrl = db.Column(db.Text)
@@ -49,6 +66,7 @@ class NailStudio(db.Model):
             'whatsapp': self.whatsapp,
             'rating': float(self.rating) if self.rating else 0.0,
             'totalReviews': self.totalReviews or 0,
+            'score': round(float(self.score), 4) if self.score else 0.0,
             'description': self.description,
             'photoUrl': self.photoUrl,
             'instagramEmbed': self.instagramEmbed,
@@ -110,4 +128,74 @@ class NailStudio(db.Model):
             else:
                 schedule[day_names[i]] = 'Tutup'
         
-        return schedule
\ No newline at end of file
+        return schedule
+    
+    def refresh_score(self, connection):
+        """Recompute the ranking score against the stored prior"""
+        prior_mean = connection.execute(
+            select(RankingPrior.priorMean).where(RankingPrior.id == RankingPrior.SINGLETON_ID)
+        ).scalar()
+        if prior_mean is None:
+            prior_mean = connection.execute(select(func.avg(NailStudio.rating))).scalar()
+        self.score = bayesian_score(
+            self.rating,
+            self.totalReviews,
+            float(prior_mean or 0.0),
+            current_app.config.get('SCORE_PRIOR_WEIGHT', 10)
+        )
+    
+    @classmethod
+    def recompute_scores(cls, prior_mean=None):
+        """Recompute every stored score in a single UPDATE and store the prior used"""
+        if prior_mean is None:
+            prior_mean = float(db.session.query(func.avg(cls.rating)).scalar() or 0.0)
+        prior_weight = current_app.config.get('SCORE_PRIOR_WEIGHT', 10)
+        
+        rating = func.coalesce(cls.rating, 0.0)
+        reviews = func.greatest(func.coalesce(cls.totalReviews, 0), 0)
+        weighted = (prior_weight * prior_mean + rating * reviews) / func.nullif(prior_weight + reviews, 0)
+        # Setting updatedAt to itself suppresses its onupdate; a prior drift isn't an edit
+        db.session.query(cls).update(
+            {cls.score: func.coalesce(weighted, rating), cls.updatedAt: cls.updatedAt},
+            synchronize_session=False
+        )
+        db.session.merge(RankingPrior(id=RankingPrior.SINGLETON_ID, priorMean=prior_mean))
+        
+        try:
+            db.session.commit()
+        except IntegrityError:
+            # Another worker stored the first prior concurrently and recomputed already
+            db.session.rollback()
+            return None
+        return prior_mean
+    
+    @classmethod
+    def sync_score_prior(cls, force=False):
+        """Recompute all scores when the global mean rating has drifted from the stored prior.
+
+        With no stored prior yet (fresh column) this backfills every score once.
+        """
+        prior_mean = float(db.session.query(func.avg(cls.rating)).scalar() or 0.0)
+        drift = current_app.config.get('SCORE_PRIOR_DRIFT', 0.05)
+        prior_query = db.session.query(RankingPrior.priorMean).filter(
+            RankingPrior.id == RankingPrior.SINGLETON_ID
+        )
+        
+        stored = prior_query.scalar()
+        if not force and stored is not None and abs(prior_mean - stored) <= drift:
+            return False
+        
+        if stored is not None:
+            # Serialise recomputes across workers; re-check once the row lock is held
+            stored = prior_query.with_for_update().scalar()
+            if not force and abs(prior_mean - stored) <= drift:
+                db.session.commit()
+                return False
+        
+        return cls.recompute_scores(prior_mean) is not None
+
+
+@event.listens_for(NailStudio, 'before_insert')
+@event.listens_for(NailStudio, 'before_update')
+def _refresh_score_before_flush(mapper, connection, target):
+    target.refresh_score(connection)
@@ -0,0 +1,15 @@
+from extensions import db
+from datetime import datetime
+
+class RankingPrior(db.Model):
+    """Single row holding the global mean rating that stored scores were computed against"""
+    __tablename__ = 'ranking_prior'
+    
+    SINGLETON_ID = 1
+    
+    id = db.Column(db.Integer, primary_key=True)
+    priorMean = db.Column(db.Float, nullable=False)
+    updatedAt = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    def __repr__(self):
+        return f'<RankingPrior {self.priorMean}>'
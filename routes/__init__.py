@@ -1,4 +1,5 @@
 from .jake_routes import jake_bp
 from .nailstudio_routes import nailstudio_bp
+from .health_routes import health_bp
 
-__all__ = ['jake_bp', 'nailstudio_bp']
\ No newline at end of file
+__all__ = ['jake_bp', 'nailstudio_bp', 'health_bp']
\ No newline at end of file
@@ -0,0 +1,71 @@
+from flask import Blueprint, current_app, jsonify
+from sqlalchemy import text
+from extensions import db
+from utils.db_pool import pool_metrics
+from utils.lifecycle import lifecycle
+from routes.jake_routes import IMAGES_FOLDER as JAKE_IMAGES_FOLDER
+from routes.nailstudio_routes import IMAGES_FOLDER as NAILS_IMAGES_FOLDER
+from datetime import datetime
+import pytz
+import time
+import os
+
+health_bp = Blueprint('health', __name__)
+
+@health_bp.route('/health')
+def health_check():
+    return {
+        'success': True,
+        'message': 'GyH API is running!',
+        'status': 'healthy',
+        'timestamp': datetime.now(pytz.timezone('Asia/Jakarta')).isoformat()
+    }
+
+@health_bp.route('/health/live')
+def liveness():
+    """Process is up and serving; never touches the database"""
+    return {
+        'success': True,
+        'status': 'alive',
+        'pid': os.getpid()
+    }
+
+@health_bp.route('/health/ready')
+def readiness():
+    """Worker is warmed up, not draining, and the DB and image folders are usable"""
+    checks = {
+        'warmed_up': lifecycle.ready,
+        'draining': lifecycle.draining,
+    }
+    ready = lifecycle.ready and not lifecycle.draining
+
+    try:
+        started = time.perf_counter()
+        db.session.execute(text('SELECT 1'))
+        latency_ms = round((time.perf_counter() - started) * 1000, 2)
+        max_latency_ms = current_app.config.get('READINESS_MAX_DB_LATENCY_MS', 500)
+        checks['database'] = {'ok': latency_ms <= max_latency_ms, 'latency_ms': latency_ms}
+    except Exception as e:
+        db.session.rollback()
+        checks['database'] = {'ok': False, 'error': str(e)}
+    ready = ready and checks['database']['ok']
+
+    for name, folder in (('jake_images', JAKE_IMAGES_FOLDER), ('nails_images', NAILS_IMAGES_FOLDER)):
+        folder_ok = os.path.isdir(folder) and os.access(folder, os.R_OK)
+        checks[name] = {'ok': folder_ok}
+        ready = ready and folder_ok
+
+    return jsonify({
+        'success': ready,
+        'status': 'ready' if ready else 'not_ready',
+        'checks': checks,
+        'warm_up_ms': lifecycle.warm_up_timings
+    }), 200 if ready else 503
+
+@health_bp.route('/metrics/pool')
+def pool_stats():
+    return {
+        'success': True,
+        'data': pool_metrics.snapshot(),
+        'message': 'DB pool metrics for this worker'
+    }
@@ -1,14 +1,27 @@
-from flask import Blueprint, request, jsonify,send_from_directory
+from flask import Blueprint, request, jsonify,send_from_directory, current_app
 from sqlalchemy import and_, or_, func, desc, asc
 from models.nailstudio import NailStudio
 from extensions import db
+from utils.suggest_index import suggest_index
+from utils.single_flight import single_flight
 from datetime import datetime
+from functools import partial
 
 nailstudio_bp = Blueprint('nailstudio', __name__)
 
 IMAGES_FOLDER = "nails_images"
 
+def run_after_commit(*hooks):
+    """Run side effects of a committed write; failures are logged, never surfaced as a failed write"""
+    for hook in hooks:
+        try:
+            hook()
+        except Exception as e:
+            db.session.rollback()
+            current_app.logger.exception(f'Post-commit hook failed: {str(e)}')
+
 @nailstudio_bp.route('/nail-studios', methods=['GET'])
+@single_flight.coalesce
 def get_nail_studios():
     """Get all nail studios with filtering and search"""
     try:
@@ -46,7 +59,10 @@ def get_nail_studios():
         if filters:
             query = query.filter(and_(*filters))
         
-        if sort_by == 'rating':
+        if sort_by == 'score':
+            direction = desc if sort_order == 'desc' else asc
+            query = query.order_by(direction(NailStudio.score), direction(NailStudio.id))
+        elif sort_by == 'rating':
             query = query.order_by(desc(NailStudio.rating) if sort_order == 'desc' else asc(NailStudio.rating))
         elif sort_by == 'created_at':
             query = query.order_by(desc(NailStudio.createdAt) if sort_order == 'desc' else asc(NailStudio.createdAt))
@@ -104,6 +120,29 @@ def get_nail_studios():
             'message': f'Error fetching nail studios: {str(e)}'
         }), 500
 
+@nailstudio_bp.route('/nail-studios/suggest', methods=['GET'])
+def suggest_nail_studios():
+    """Typeahead suggestions by nama/desa prefix, ranked by rating"""
+    try:
+        q = request.args.get('q', '').strip()
+        limit = request.args.get('limit', type=int)
+        
+        suggest_index.ensure_fresh()
+        suggestions = suggest_index.search(q, limit)
+        
+        return jsonify({
+            'success': True,
+            'data': suggestions,
+            'query': q,
+            'message': f'Found {len(suggestions)} suggestions'
+        })
+        
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'message': f'Error fetching suggestions: {str(e)}'
+        }), 500
+
 @nailstudio_bp.route('/nail-studios/<studio_id>', methods=['GET'])
 def get_nail_studio(studio_id):
     """Get single nail studio by ID"""
@@ -161,6 +200,11 @@ def create_nail_studio():
         
         db.session.add(studio)
         db.session.commit()
+        run_after_commit(
+            NailStudio.sync_score_prior,
+            partial(suggest_index.upsert, studio),
+            single_flight.invalidate
+        )
         
         return jsonify({
             'success': True,
@@ -230,6 +274,10 @@ def update_nail_studio(studio_id):
         studio.updatedAt = datetime.utcnow()
         
         db.session.commit()
+        hooks = [partial(suggest_index.upsert, studio), single_flight.invalidate]
+        if 'rating' in data or 'totalReviews' in data:
+            hooks.insert(0, NailStudio.sync_score_prior)
+        run_after_commit(*hooks)
         
         return jsonify({
             'success': True,
@@ -274,6 +322,7 @@ def update_survey_status(studio_id):
         studio.updatedAt = datetime.utcnow()
         
         db.session.commit()
+        run_after_commit(single_flight.invalidate)
         
         return jsonify({
             'success': True,
@@ -306,6 +355,11 @@ def delete_nail_studio(studio_id):
         studio_name = studio.nama
         db.session.delete(studio)
         db.session.commit()
+        run_after_commit(
+            NailStudio.sync_score_prior,
+            partial(suggest_index.remove, studio_id),
+            single_flight.invalidate
+        )
         
         return jsonify({
             'success': True,
@@ -320,6 +374,7 @@ def delete_nail_studio(studio_id):
         }), 500
 
 @nailstudio_bp.route('/nail-studios/stats', methods=['GET'])
+@single_flight.coalesce
 def get_stats():
     """Get nail studios statistics"""
     try:
@@ -0,0 +1,17 @@
+from .suggest_index import suggest_index
+from .compression import compressor
+from .json_provider import init_json_provider
+from .single_flight import single_flight
+from .db_pool import pool_metrics, configure_pool, warm_pool
+from .lifecycle import lifecycle
+
+__all__ = [
+    'suggest_index',
+    'compressor',
+    'init_json_provider',
+    'single_flight',
+    'pool_metrics',
+    'configure_pool',
+    'warm_pool',
+    'lifecycle',
+]
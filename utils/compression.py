@@ -0,0 +1,93 @@
+import gzip
+from flask import request
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - optional dependency
+    brotli = None
+
+COMPRESSIBLE_MIMETYPES = {
+    'application/json',
+    'application/javascript',
+    'text/html',
+    'text/plain',
+    'text/css',
+}
+
+
+class Compressor:
+    """Negotiates gzip/brotli for response bodies above a size threshold.
+
+    Responses carrying a ``precompressed`` dict (encoding -> bytes), such as
+    those replayed from a response cache, are served from it when the
+    negotiated encoding is present; otherwise the body is compressed once and
+    stored in that dict, so each encoding is only paid for when asked for.
+    """
+
+    def __init__(self, app=None):
+        self.min_size = 1024
+        self.gzip_level = 6
+        self.br_level = 4
+        self.algorithms = ['br', 'gzip']
+        self.enabled = False
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.min_size = app.config.get('COMPRESS_MIN_SIZE', 1024)
+        self.gzip_level = app.config.get('COMPRESS_GZIP_LEVEL', 6)
+        self.br_level = app.config.get('COMPRESS_BR_LEVEL', 4)
+        self.algorithms = [
+            algorithm for algorithm in app.config.get('COMPRESS_ALGORITHMS', ['br', 'gzip'])
+            if algorithm == 'gzip' or (algorithm == 'br' and brotli is not None)
+        ]
+        app.extensions['compressor'] = self
+
+        self.enabled = app.config.get('COMPRESS_ENABLED', True)
+        if self.enabled:
+            app.after_request(self.after_request)
+
+    def negotiate(self, accept_encodings):
+        """Pick the first configured algorithm the client accepts"""
+        for algorithm in self.algorithms:
+            if accept_encodings.quality(algorithm) > 0:
+                return algorithm
+        return None
+
+    def compress(self, data, encoding):
+        if encoding == 'br':
+            return brotli.compress(data, quality=self.br_level)
+        return gzip.compress(data, compresslevel=self.gzip_level)
+
+    def after_request(self, response):
+        if (
+            response.direct_passthrough
+            or response.is_streamed
+            or not 200 <= response.status_code < 300
+            or 'Content-Encoding' in response.headers
+            or response.mimetype not in COMPRESSIBLE_MIMETYPES
+        ):
+            return response
+
+        response.vary.add('Accept-Encoding')
+        encoding = self.negotiate(request.accept_encodings)
+        if encoding is None:
+            return response
+
+        precompressed = getattr(response, 'precompressed', None)
+        if precompressed is not None and encoding in precompressed:
+            body = precompressed[encoding]
+        else:
+            data = response.get_data()
+            if len(data) < self.min_size:
+                return response
+            body = self.compress(data, encoding)
+            if precompressed is not None:
+                precompressed[encoding] = body
+
+        response.set_data(body)
+        response.headers['Content-Encoding'] = encoding
+        return response
+
+
+compressor = Compressor()
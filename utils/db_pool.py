@@ -0,0 +1,223 @@
+import os
+import time
+import bisect
+import threading
+from flask import has_request_context, request
+from sqlalchemy import event, exc
+from sqlalchemy.pool import QueuePool
+
+# Upper bounds (ms) of the pool wait histogram buckets; the last bucket is open-ended
+WAIT_BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 5000)
+
+
+class PoolMetrics:
+    """Per-worker connection pool telemetry"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.logger = None
+        self.slow_wait_ms = 100
+        self.pool = None
+        self.reset()
+
+    def init_app(self, app):
+        self.logger = app.logger
+        self.slow_wait_ms = app.config.get('DB_POOL_SLOW_WAIT_MS', 100)
+        if not event.contains(InstrumentedQueuePool, 'invalidate', self._on_invalidate):
+            event.listen(InstrumentedQueuePool, 'invalidate', self._on_invalidate)
+        app.extensions['pool_metrics'] = self
+
+    def reset(self):
+        with self._lock:
+            self.checkouts = 0
+            self.timeouts = 0
+            self.pre_ping_failures = 0
+            self.invalidations = 0
+            self.wait_total_ms = 0.0
+            self.wait_max_ms = 0.0
+            self.wait_buckets = [0] * (len(WAIT_BUCKETS_MS) + 1)
+            self.connects = 0
+            self.connect_total_ms = 0.0
+            self.connect_max_ms = 0.0
+
+    def _route(self):
+        if has_request_context():
+            return f'{request.method} {request.path} ({request.endpoint})'
+        return 'outside request'
+
+    def record_wait(self, wait_ms):
+        with self._lock:
+            self.checkouts += 1
+            self.wait_total_ms += wait_ms
+            self.wait_max_ms = max(self.wait_max_ms, wait_ms)
+            self.wait_buckets[bisect.bisect_left(WAIT_BUCKETS_MS, wait_ms)] += 1
+
+        if self.logger is not None and wait_ms >= self.slow_wait_ms:
+            self.logger.warning(f'Slow DB pool checkout: waited {wait_ms:.1f}ms on {self._route()}')
+
+    def record_timeout(self, wait_ms):
+        with self._lock:
+            self.timeouts += 1
+        if self.logger is not None:
+            self.logger.error(f'DB pool checkout timed out after {wait_ms:.1f}ms on {self._route()}')
+
+    def record_connect(self, connect_ms):
+        with self._lock:
+            self.connects += 1
+            self.connect_total_ms += connect_ms
+            self.connect_max_ms = max(self.connect_max_ms, connect_ms)
+
+    def _on_invalidate(self, dbapi_connection, connection_record, exception):
+        with self._lock:
+            self.invalidations += 1
+            if isinstance(exception, exc.DisconnectionError):
+                self.pre_ping_failures += 1
+
+    def snapshot(self):
+        """Current pool state and counters for this worker"""
+        pool = self.pool
+        with self._lock:
+            histogram = [
+                {'le_ms': bound, 'count': count}
+                for bound, count in zip(WAIT_BUCKETS_MS + (None,), self.wait_buckets)
+            ]
+            return {
+                'pid': os.getpid(),
+                'pool_size': pool.size() if pool is not None else None,
+                'checked_out': pool.checkedout() if pool is not None else None,
+                'checked_in': pool.checkedin() if pool is not None else None,
+                'overflow': pool.overflow() if pool is not None else None,
+                'max_overflow': pool._max_overflow if pool is not None else None,
+                'checkouts': self.checkouts,
+                'timeouts': self.timeouts,
+                'pre_ping_failures': self.pre_ping_failures,
+                'invalidations': self.invalidations,
+                'wait_ms': {
+                    'avg': round(self.wait_total_ms / self.checkouts, 3) if self.checkouts else 0.0,
+                    'max': round(self.wait_max_ms, 3),
+                    'histogram': histogram,
+                },
+                'connect_ms': {
+                    'count': self.connects,
+                    'avg': round(self.connect_total_ms / self.connects, 3) if self.connects else 0.0,
+                    'max': round(self.connect_max_ms, 3),
+                },
+            }
+
+
+pool_metrics = PoolMetrics()
+
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool that reports how long each checkout waited for a connection.
+
+    Time spent opening a new connection (overflow or a replaced one) is
+    recorded separately as connect latency and excluded from the wait, so
+    the wait histogram and slow-checkout warnings only reflect queueing.
+    """
+
+    _local = threading.local()
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        pool_metrics.pool = self
+
+    def _create_connection(self):
+        start = time.perf_counter()
+        try:
+            return super()._create_connection()
+        finally:
+            connect_ms = (time.perf_counter() - start) * 1000
+            self._local.connect_ms = getattr(self._local, 'connect_ms', 0.0) + connect_ms
+            pool_metrics.record_connect(connect_ms)
+
+    def _do_get(self):
+        # QueuePool._do_get retries by calling itself; only time the outermost call
+        if getattr(self._local, 'timing', False):
+            return super()._do_get()
+
+        self._local.timing = True
+        self._local.connect_ms = 0.0
+        start = time.perf_counter()
+        try:
+            record = super()._do_get()
+        except exc.TimeoutError:
+            pool_metrics.record_timeout((time.perf_counter() - start) * 1000 - self._local.connect_ms)
+            raise
+        finally:
+            self._local.timing = False
+        pool_metrics.record_wait((time.perf_counter() - start) * 1000 - self._local.connect_ms)
+        return record
+
+
+def derive_pool_options(config):
+    """Size the pool from the worker/thread count and a global connection budget.
+
+    Each worker gets an equal share of DB_CONNECTION_BUDGET. The steady-state
+    pool holds one connection per thread and the rest of the share is
+    overflow, so N workers can never open more than the budget. Raises
+    ValueError when the budget can't give every worker a connection.
+    """
+    workers = max(1, int(config.get('WEB_CONCURRENCY', 1)))
+    threads = max(1, int(config.get('WEB_THREADS', 1)))
+    budget = max(1, int(config.get('DB_CONNECTION_BUDGET', 80)))
+
+    if budget < workers:
+        raise ValueError(
+            f'DB_CONNECTION_BUDGET={budget} is below WEB_CONCURRENCY={workers}; '
+            f'every worker needs at least one connection'
+        )
+
+    per_worker = budget // workers
+    pool_size = min(threads, per_worker)
+    return {
+        'pool_size': pool_size,
+        'max_overflow': per_worker - pool_size,
+    }
+
+
+def configure_pool(app):
+    """Apply DB_POOL_MODE and the instrumented pool to SQLALCHEMY_ENGINE_OPTIONS"""
+    options = dict(app.config.get('SQLALCHEMY_ENGINE_OPTIONS', {}))
+
+    if app.config.get('DB_POOL_MODE', 'static') == 'adaptive':
+        options.update(derive_pool_options(app.config))
+        app.logger.info(
+            f"Adaptive DB pool: pool_size={options['pool_size']}, "
+            f"max_overflow={options['max_overflow']} "
+            f"(workers={app.config.get('WEB_CONCURRENCY')}, threads={app.config.get('WEB_THREADS')}, "
+            f"budget={app.config.get('DB_CONNECTION_BUDGET')})"
+        )
+        threads = max(1, int(app.config.get('WEB_THREADS', 1)))
+        if options['pool_size'] < threads:
+            app.logger.warning(
+                f"DB_CONNECTION_BUDGET allows {options['pool_size']} connections per worker for "
+                f"{threads} threads; requests beyond that queue for up to pool_timeout"
+            )
+
+    if app.config.get('DB_POOL_METRICS', True) and 'poolclass' not in options:
+        options['poolclass'] = InstrumentedQueuePool
+        pool_metrics.init_app(app)
+
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = options
+    return options
+
+
+def warm_pool(engine, deadline=None, count=None):
+    """Open up to count (default pool_size) connections so the first requests don't pay for connect.
+
+    Best effort: no new connection is started once time.monotonic() passes
+    deadline, so a slow database costs at most one more connect timeout.
+    Returns how many connections were opened.
+    """
+    count = count or engine.pool.size()
+    connections = []
+    try:
+        for _ in range(count):
+            if deadline is not None and time.monotonic() >= deadline:
+                break
+            connections.append(engine.connect())
+    finally:
+        for connection in connections:
+            connection.close()
+    return len(connections)
@@ -0,0 +1,58 @@
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """JSON provider backed by orjson, falling back to the stdlib for custom kwargs"""
+
+    def _option(self, pretty=False):
+        option = orjson.OPT_NON_STR_KEYS
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if pretty:
+            option |= orjson.OPT_INDENT_2
+        return option
+
+    def dumps(self, obj, **kwargs):
+        if kwargs:
+            return super().dumps(obj, **kwargs)
+        return orjson.dumps(obj, default=self.default, option=self._option()).decode('utf-8')
+
+    def loads(self, s, **kwargs):
+        if kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        pretty = self.compact is False or (self.compact is None and self._app.debug)
+        return self._app.response_class(
+            orjson.dumps(obj, default=self.default, option=self._option(pretty)),
+            mimetype=self.mimetype
+        )
+
+
+JSON_PROVIDERS = {
+    'default': DefaultJSONProvider,
+    'orjson': OrjsonProvider,
+}
+
+
+def init_json_provider(app):
+    """Install the JSON provider named by JSON_PROVIDER"""
+    name = app.config.get('JSON_PROVIDER', 'orjson')
+    provider_class = JSON_PROVIDERS.get(name)
+
+    if provider_class is None:
+        raise ValueError(f"Unknown JSON_PROVIDER '{name}'. Choose from: {', '.join(JSON_PROVIDERS)}")
+
+    if provider_class is OrjsonProvider and orjson is None:
+        app.logger.warning('orjson is not installed, using the stdlib JSON provider')
+        provider_class = DefaultJSONProvider
+
+    app.json = provider_class(app)
+    return app.json
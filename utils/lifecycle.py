@@ -0,0 +1,89 @@
+import signal
+import threading
+import time
+
+
+class Lifecycle:
+    """Worker readiness state: warmed up, and not yet draining for shutdown"""
+
+    def __init__(self):
+        self.ready = False
+        self.draining = False
+        self.warm_up_timings = {}
+
+    def warm_up(self, app):
+        """Prime the DB pool, the score prior and the suggest index, and list the image folder.
+
+        Runs before a gunicorn worker's first heartbeat, so it is bounded: each
+        connection attempt is capped by DB_CONNECT_TIMEOUT, DB steps are skipped
+        once one has failed (the DB is down, the rest would wait too), and
+        neither a step nor a pool connection starts after WARMUP_BUDGET_SECONDS.
+        Failures are logged, not raised; readiness reports the DB as down instead.
+        """
+        from extensions import db
+        from models.nailstudio import NailStudio
+        from routes.jake_routes import get_existing_image_numbers
+        from .db_pool import warm_pool
+        from .suggest_index import suggest_index
+
+        budget = app.config.get('WARMUP_BUDGET_SECONDS', 15)
+        deadline = time.monotonic() + budget
+
+        # (name, step, needs_db)
+        steps = [
+            ('db_pool', lambda: warm_pool(db.engine, deadline), True),
+            ('score_prior', NailStudio.sync_score_prior, True),
+            ('suggest_index', suggest_index.rebuild, True),
+            ('image_index', get_existing_image_numbers, False),
+        ]
+
+        timings = {}
+        db_failed = False
+        started = time.perf_counter()
+        with app.app_context():
+            for name, step, needs_db in steps:
+                if needs_db and db_failed:
+                    timings[name] = 'skipped'
+                    continue
+                if time.monotonic() >= deadline:
+                    app.logger.warning(f'Warm-up budget of {budget}s spent, skipping {name}')
+                    timings[name] = 'skipped'
+                    continue
+
+                step_started = time.perf_counter()
+                try:
+                    step()
+                except Exception as e:
+                    db.session.rollback()
+                    db_failed = db_failed or needs_db
+                    app.logger.warning(f'Warm-up step {name} failed: {str(e)}')
+                timings[name] = round((time.perf_counter() - step_started) * 1000, 1)
+        timings['total'] = round((time.perf_counter() - started) * 1000, 1)
+
+        self.warm_up_timings = timings
+        self.ready = True
+        return timings
+
+    def install_drain_handler(self, worker, drain_seconds):
+        """Replace a gunicorn worker's SIGTERM handler with one that drains first.
+
+        On SIGTERM the worker reports not-ready so the load balancer stops
+        routing to it, keeps serving for drain_seconds, then exits through
+        gunicorn's normal graceful path.
+        """
+        handle_exit = worker.handle_exit
+
+        def handle_term(sig, frame):
+            if self.draining:
+                return
+            self.draining = True
+            worker.log.info(f'Draining for {drain_seconds}s before shutdown')
+            timer = threading.Timer(drain_seconds, handle_exit, args=(sig, frame))
+            timer.daemon = True
+            timer.start()
+
+        signal.signal(signal.SIGTERM, handle_term)
+        signal.siginterrupt(signal.SIGTERM, False)
+
+
+lifecycle = Lifecycle()
@@ -0,0 +1,274 @@
+import os
+import json
+import stat
+import time
+import hashlib
+import tempfile
+import threading
+from collections import OrderedDict
+from functools import wraps
+from urllib.parse import urlencode
+from flask import current_app, request
+
+from .version_stamp import VersionStamp
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - not available on Windows
+    fcntl = None
+
+
+class _Entry:
+    __slots__ = ('status', 'mimetype', 'body', 'precompressed', 'created', 'version')
+
+    def __init__(self, status, mimetype, body, precompressed, created, version):
+        self.status = status
+        self.mimetype = mimetype
+        self.body = body
+        self.precompressed = precompressed
+        self.created = created
+        self.version = version
+
+
+class _Flight:
+    __slots__ = ('event', 'entry')
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.entry = None
+
+
+class SingleFlight:
+    """Coalesces identical concurrent GET requests into one computation.
+
+    Within a worker, the first request for a key computes the response and
+    concurrent callers wait for it. With SINGLE_FLIGHT_LOCK_DIR set, workers
+    on the same host also serialise on one of SINGLE_FLIGHT_LOCK_STRIPES lock
+    files and share the result through that stripe's entry file, so the
+    directory never holds more than two files per stripe. Responses stay fresh for
+    SINGLE_FLIGHT_TTL seconds; for SINGLE_FLIGHT_STALE seconds after that one
+    request refreshes while the rest are served the stale copy. Writes call
+    invalidate(), which expires every entry in every worker.
+    """
+
+    def __init__(self, app=None):
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self._flights = {}
+        self.stamp = VersionStamp()
+        self.ttl = 1.0
+        self.stale = 5.0
+        self.wait_timeout = 10.0
+        self.max_entries = 256
+        self.lock_stripes = 64
+        self.lock_dir = None
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.ttl = app.config.get('SINGLE_FLIGHT_TTL', 1.0)
+        self.stale = app.config.get('SINGLE_FLIGHT_STALE', 5.0)
+        self.wait_timeout = app.config.get('SINGLE_FLIGHT_WAIT_TIMEOUT', 10.0)
+        self.max_entries = app.config.get('SINGLE_FLIGHT_MAX_ENTRIES', 256)
+        self.lock_stripes = max(1, app.config.get('SINGLE_FLIGHT_LOCK_STRIPES', 64))
+        self.stamp.path = app.config.get('SINGLE_FLIGHT_VERSION_FILE') or os.path.join(
+            tempfile.gettempdir(), 'gyh_single_flight.version'
+        )
+
+        lock_dir = app.config.get('SINGLE_FLIGHT_LOCK_DIR') if fcntl is not None else None
+        self.lock_dir = self._private_dir(lock_dir, app.logger) if lock_dir else None
+
+        app.extensions['single_flight'] = self
+
+    @staticmethod
+    def _private_dir(path, logger):
+        """Create path as 0700, and refuse it unless it is a real directory only we can write"""
+        try:
+            os.makedirs(path, mode=0o700, exist_ok=True)
+            st = os.lstat(path)
+        except OSError as e:
+            logger.error(f'Cross-worker single-flight disabled: cannot create {path}: {str(e)}')
+            return None
+
+        if not stat.S_ISDIR(st.st_mode) or st.st_uid != os.getuid() or st.st_mode & 0o077:
+            logger.error(
+                f'Cross-worker single-flight disabled: {path} must be a directory owned by '
+                f'uid {os.getuid()} with mode 0700'
+            )
+            return None
+        return path
+
+    # Local entries
+
+    def _get_local(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def _set_local(self, key, entry):
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def _age(self, entry, version):
+        if entry is None or entry.version != version:
+            return None
+        return time.time() - entry.created
+
+    # Shared entries (cross-worker)
+
+    def _paths(self, key):
+        digest = hashlib.sha1(key.encode('utf-8')).digest()
+        stripe = int.from_bytes(digest[:4], 'big') % self.lock_stripes
+        base = os.path.join(self.lock_dir, f'stripe-{stripe}')
+        return base + '.lock', base + '.entry'
+
+    def _read_shared(self, entry_path, key):
+        # Format: one JSON header line, then the raw body bytes
+        try:
+            with open(entry_path, 'rb') as f:
+                header = json.loads(f.readline())
+                body = f.read()
+            if header['key'] != key:
+                return None
+            return _Entry(
+                header['status'],
+                header['mimetype'],
+                body,
+                {},
+                header['created'],
+                tuple(header['version'])
+            )
+        except (OSError, ValueError, TypeError, KeyError):
+            return None
+
+    def _write_shared(self, entry_path, key, entry):
+        header = json.dumps({
+            'key': key,
+            'status': entry.status,
+            'mimetype': entry.mimetype,
+            'created': entry.created,
+            'version': entry.version,
+        }).encode('utf-8')
+        tmp_path = f'{entry_path}.{os.getpid()}.{threading.get_ident()}.tmp'
+        try:
+            with open(tmp_path, 'wb') as f:
+                f.write(header + b'\n' + entry.body)
+            os.replace(tmp_path, entry_path)
+        except OSError:
+            current_app.logger.warning(f'Could not write shared single-flight entry {entry_path}')
+
+    def _acquire_file_lock(self, lock_file):
+        deadline = time.monotonic() + self.wait_timeout
+        while True:
+            try:
+                fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                return True
+            except BlockingIOError:
+                if time.monotonic() >= deadline:
+                    return False
+                time.sleep(0.01)
+
+    def _compute_shared(self, key, compute, version):
+        if not self.lock_dir:
+            return compute(version)
+
+        lock_path, entry_path = self._paths(key)
+        with open(lock_path, 'a') as lock_file:
+            locked = self._acquire_file_lock(lock_file)
+            try:
+                entry = self._read_shared(entry_path, key)
+                age = self._age(entry, version)
+                if age is not None and age < self.ttl:
+                    return entry
+
+                entry = compute(version)
+                if entry.status == 200:
+                    self._write_shared(entry_path, key, entry)
+                return entry
+            finally:
+                if locked:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    # Coalescing
+
+    def _lead(self, key, compute, version, flight):
+        try:
+            entry = self._compute_shared(key, compute, version)
+            if entry.status == 200:
+                self._set_local(key, entry)
+            flight.entry = entry
+            return entry
+        finally:
+            with self._lock:
+                self._flights.pop(key, None)
+            flight.event.set()
+
+    def get_or_compute(self, key, compute):
+        """Return a fresh, stale or newly computed entry for key"""
+        version = self.stamp.read()
+        entry = self._get_local(key)
+        age = self._age(entry, version)
+
+        if age is not None and age < self.ttl:
+            return entry
+
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+
+        if not leader:
+            if age is not None and age < self.ttl + self.stale:
+                return entry
+            if flight.event.wait(self.wait_timeout) and flight.entry is not None:
+                return flight.entry
+            return compute(version)
+
+        return self._lead(key, compute, version, flight)
+
+    def invalidate(self):
+        """Expire all cached entries in every worker"""
+        # Shared entry files carry the stamp they were computed under, so bumping
+        # it is enough to make them misses; they get overwritten in place
+        self.stamp.bump()
+        with self._lock:
+            self._entries.clear()
+
+    def coalesce(self, view):
+        """Decorator for GET views whose response depends only on path and query"""
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            if request.method != 'GET':
+                return view(*args, **kwargs)
+
+            # urlencode escapes & and = inside values, so distinct queries never share a key
+            key = request.path + '?' + urlencode(sorted(request.args.items(multi=True)))
+
+            def compute(version):
+                response = current_app.make_response(view(*args, **kwargs))
+                # precompressed starts empty; the compressor fills in an encoding
+                # the first time a client negotiates it for this entry
+                return _Entry(
+                    response.status_code,
+                    response.mimetype,
+                    response.get_data(),
+                    {},
+                    time.time(),
+                    version
+                )
+
+            entry = self.get_or_compute(key, compute)
+            response = current_app.response_class(entry.body, status=entry.status, mimetype=entry.mimetype)
+            response.precompressed = entry.precompressed
+            return response
+
+        return wrapper
+
+
+single_flight = SingleFlight()
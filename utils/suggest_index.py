@@ -0,0 +1,146 @@
+import os
+import bisect
+import heapq
+import tempfile
+import threading
+
+from .version_stamp import VersionStamp
+
+
+def normalize(text):
+    """Lowercase and collapse whitespace for prefix matching"""
+    return ' '.join((text or '').lower().split())
+
+
+class SuggestIndex:
+    """In-process prefix index over nail studio nama and desa.
+
+    Keys are kept in a sorted list so a prefix lookup is a bisect plus a
+    short forward scan. Every word start in nama and desa is indexed, so
+    "nails" matches "Berry Nails". Workers share a version stamp file; when
+    another worker writes, the stamp changes and this worker rebuilds.
+    """
+
+    def __init__(self, app=None):
+        self._lock = threading.Lock()
+        self._records = {}
+        self._keys = []
+        self._version = None
+        self.stamp = VersionStamp()
+        self.max_results = 10
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.stamp.path = app.config.get('SUGGEST_VERSION_FILE') or os.path.join(
+            tempfile.gettempdir(), 'gyh_suggest_index.version'
+        )
+        self.max_results = app.config.get('SUGGEST_MAX_RESULTS', 10)
+        app.extensions['suggest_index'] = self
+
+    # Building
+
+    @staticmethod
+    def _record(studio):
+        return {
+            'id': studio.id,
+            'nama': studio.nama,
+            'desa': studio.desa,
+            'rating': float(studio.rating) if studio.rating else 0.0,
+            'totalReviews': studio.totalReviews or 0,
+        }
+
+    @staticmethod
+    def _keys_for(record):
+        keys = set()
+        for field in ('nama', 'desa'):
+            words = normalize(record[field]).split(' ')
+            for i in range(len(words)):
+                key = ' '.join(words[i:])
+                if key:
+                    keys.add((key, record['id']))
+        return keys
+
+    def _reindex(self):
+        keys = []
+        for record in self._records.values():
+            keys.extend(self._keys_for(record))
+        keys.sort()
+        self._keys = keys
+
+    def build(self, studios, version):
+        """Replace the whole index with the given studios, as of stamp version"""
+        records = {studio.id: self._record(studio) for studio in studios}
+        with self._lock:
+            self._records = records
+            self._reindex()
+            self._version = version
+
+    def rebuild(self):
+        """Reload the index from the database"""
+        from models.nailstudio import NailStudio
+
+        # Read the stamp before querying: a write landing in between then shows
+        # up as a newer stamp and triggers another rebuild, rather than being lost
+        version = self.stamp.read()
+        self.build(NailStudio.query.with_entities(
+            NailStudio.id,
+            NailStudio.nama,
+            NailStudio.desa,
+            NailStudio.rating,
+            NailStudio.totalReviews
+        ).all(), version)
+
+    def ensure_fresh(self):
+        """Rebuild if another worker has written since the last sync"""
+        if self._version is None or self._version != self.stamp.read():
+            self.rebuild()
+
+    # Write hooks
+
+    def _bump(self):
+        # Only adopt the new stamp if no other write landed since our last sync;
+        # otherwise another worker's change is missing locally and the next lookup rebuilds
+        seen = self._version
+        version = self.stamp.bump(seen)
+        self._version = version if seen is not None else None
+
+    def upsert(self, studio):
+        with self._lock:
+            self._records[studio.id] = self._record(studio)
+            self._reindex()
+        self._bump()
+
+    def remove(self, studio_id):
+        with self._lock:
+            if self._records.pop(studio_id, None) is not None:
+                self._reindex()
+        self._bump()
+
+    # Lookup
+
+    def search(self, query, limit=None):
+        """Return the top-k records whose nama or desa has a word starting with query"""
+        prefix = normalize(query)
+        if not prefix:
+            return []
+        limit = min(limit or self.max_results, self.max_results)
+
+        keys = self._keys
+        records = self._records
+        matches = {}
+        i = bisect.bisect_left(keys, (prefix,))
+        while i < len(keys) and keys[i][0].startswith(prefix):
+            studio_id = keys[i][1]
+            if studio_id not in matches and studio_id in records:
+                matches[studio_id] = records[studio_id]
+            i += 1
+
+        return heapq.nlargest(
+            limit,
+            matches.values(),
+            key=lambda r: (r['rating'], r['totalReviews'])
+        )
+
+
+suggest_index = SuggestIndex()
@@ -0,0 +1,41 @@
+import os
+
+
+class VersionStamp:
+    """Cross-worker change marker backed by an append-only file.
+
+    Writers call bump(), which appends one byte; readers compare read()
+    against the value they last saw. The version is (size, mtime): the size
+    grows with every bump, so two writes within one timestamp tick still
+    differ. A stat() is cheap enough to run on every request.
+    """
+
+    def __init__(self, path=None):
+        self.path = path
+
+    def read(self):
+        try:
+            st = os.stat(self.path)
+        except (OSError, TypeError):
+            return (0, 0)
+        return (st.st_size, st.st_mtime_ns)
+
+    def bump(self, seen=None):
+        """Record a write and return the new version.
+
+        If seen is given, return None unless it was the version immediately
+        before this write, i.e. no other worker wrote in between.
+        """
+        try:
+            fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o600)
+            try:
+                os.write(fd, b'.')
+                st = os.fstat(fd)
+            finally:
+                os.close(fd)
+        except (OSError, TypeError):
+            return self.read()
+
+        if seen is not None and seen[0] + 1 != st.st_size:
+            return None
+        return (st.st_size, st.st_mtime_ns)
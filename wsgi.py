@@ -0,0 +1,8 @@
+# wsgi.py - Production entry point (gunicorn -c gunicorn.conf.py wsgi:app)
+#
+# Imported once in the gunicorn master (preload_app) so workers fork with Flask,
+# SQLAlchemy, the models and routes already loaded. Warm-up is deferred to each
+# worker (see gunicorn.conf.py) because DB connections must not cross a fork.
+from app import create_app
+
+app = create_app()